@@ -1,9 +1,15 @@
 import os
 import re
 import json
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+import sys
+import time
+from dataclasses import dataclass, field
+from operator import attrgetter
+from datetime import date, datetime, timedelta
+from typing import ClassVar, Optional
+from flask import Flask, make_response, render_template, request, redirect, url_for, session, flash
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 app = Flask(__name__)
@@ -19,52 +25,178 @@ WEBDAV_URL = os.environ.get('WEBDAV_URL')
 WEBDAV_USERNAME = os.environ.get('WEBDAV_USERNAME')
 WEBDAV_PASSWORD = os.environ.get('WEBDAV_PASSWORD')
 
-LINK_RE = re.compile(r"\[\[([^\]]+)\]\]")
-PROJECT_RE = re.compile(r"\+([^\s]+)")
-CONTEXT_RE = re.compile(r"@([^\s]+)")
-DUE_RE = re.compile(r"due:(\d{4}-\d{2}-\d{2})")
+_WEBDAV_AUTH = HTTPBasicAuth(WEBDAV_USERNAME, WEBDAV_PASSWORD) if (WEBDAV_USERNAME and WEBDAV_PASSWORD) else None
+
+# Shared session so WebDAV requests reuse pooled keep-alive connections
+_WEBDAV_SESSION = requests.Session()
+_WEBDAV_SESSION.auth = _WEBDAV_AUTH
+_WEBDAV_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_WEBDAV_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# All metadata tokens in one alternation so a line is scanned only once
+TOKEN_RE = re.compile(
+    r"\+(?P<project>[^\s]+)"
+    r"|@(?P<context>[^\s]+)"
+    r"|due:(?P<due>\d{4}-\d{2}-\d{2})"
+    r"|\[\[(?P<reference>[^\]]+)\]\]"
+    r"|\^(?P<marker>[A-Za-z0-9]+)"
+)
+_CB_UNCHECKED = "- [ ]"
+_CB_CHECKED_LC = "- [x]"
+_CB_CHECKED_UC = "- [X]"
+# Checkbox prefix -> done state
+_CB_STATES = {_CB_CHECKED_LC: True, _CB_CHECKED_UC: True, _CB_UNCHECKED: False}
+# Earliest metadata marker; everything before it is the title
+TITLE_CUT_RE = re.compile(r"[+@^✅]|due:|\[\[")
 ID_RE = re.compile(r"\^([A-Za-z0-9]+)")
 COMPLETION_RE = re.compile(r"\s✅\s\d{4}-\d{2}-\d{2}")
 
-def read_content():
+@dataclass(slots=True)
+class Todo:
+    line_index: int
+    marker: Optional[str]
+    title: str
+    section: str
+    project: Optional[str]
+    context: Optional[str]
+    due: Optional[date]
+    reference: Optional[str]
+    done: bool
+    raw_line: str
+    # Sort keys, filled in by add_sort_keys
+    topic_key: Optional[tuple] = field(default=None, repr=False)
+    location_key: Optional[tuple] = field(default=None, repr=False)
+    date_key: Optional[tuple] = field(default=None, repr=False)
+
+    # Fields exported by the JSON API
+    JSON_FIELDS: ClassVar[tuple] = (
+        'line_index', 'marker', 'title', 'section', 'project',
+        'context', 'due', 'reference', 'done', 'raw_line'
+    )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.JSON_FIELDS}
+
+# Decoded file content, keyed by path (local) or URL (WebDAV)
+_CONTENT_CACHE = {}
+WEBDAV_CACHE_TTL = 2.0
+# (content, items) for the last parse; replaced as a whole so concurrent
+# requests never see a key paired with another content's items
+_TODOS_CACHE = (None, None)
+# (content, lines with their line endings), replaced as a whole like
+# _TODOS_CACHE so write_line never splices lines of another content
+_LINES_CACHE = (None, None)
+
+def read_content(fresh=False):
+    # fresh=True skips the WebDAV TTL cache; read-modify-write paths need it
+    # so a PUT is never built on a body another client has since changed.
+    # The local cache is validated by mtime/size and always current.
     if USE_WEBDAV:
         if not WEBDAV_URL:
             return ""
+        # Coalesce bursts of requests (e.g. page reloads) into one GET
+        cached = _CONTENT_CACHE.get(WEBDAV_URL)
+        if not fresh and cached and time.monotonic() - cached[0] < WEBDAV_CACHE_TTL:
+            return cached[1]
         try:
-            auth = None
-            if WEBDAV_USERNAME and WEBDAV_PASSWORD:
-                auth = HTTPBasicAuth(WEBDAV_USERNAME, WEBDAV_PASSWORD)
-            
-            response = requests.get(WEBDAV_URL, auth=auth, timeout=10)
+            response = _WEBDAV_SESSION.get(WEBDAV_URL, timeout=10)
             response.raise_for_status()
-            return response.text
+            content = response.text
+            _CONTENT_CACHE[WEBDAV_URL] = (time.monotonic(), content)
+            return content
         except Exception as e:
             print(f"WebDAV read error: {e}")
             return ""
     else:
-        if not os.path.exists(TODO_PATH):
+        try:
+            st = os.stat(TODO_PATH)
+        except FileNotFoundError:
             return ""
-        with open(TODO_PATH, 'r', encoding='utf-8') as f:
-            return f.read()
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _CONTENT_CACHE.get(TODO_PATH)
+        if cached and cached[0] == key:
+            return cached[1]
+        # newline='' keeps line endings as on disk so write_line offsets
+        # match the file's bytes
+        with open(TODO_PATH, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        _CONTENT_CACHE[TODO_PATH] = (key, content)
+        return content
+
+def forget_content(source):
+    global _TODOS_CACHE
+    _CONTENT_CACHE.pop(source, None)
+    _TODOS_CACHE = (None, None)
 
 def write_content(content):
     if USE_WEBDAV:
         if not WEBDAV_URL:
             return
         try:
-            auth = None
-            if WEBDAV_USERNAME and WEBDAV_PASSWORD:
-                auth = HTTPBasicAuth(WEBDAV_USERNAME, WEBDAV_PASSWORD)
-            
-            response = requests.put(WEBDAV_URL, data=content.encode('utf-8'), auth=auth, timeout=10)
+            response = _WEBDAV_SESSION.put(WEBDAV_URL, data=content.encode('utf-8'), timeout=10)
             response.raise_for_status()
         except Exception as e:
             print(f"WebDAV write error: {e}")
+        finally:
+            # After the PUT, so a GET that was in flight cannot re-cache the
+            # old body
+            forget_content(WEBDAV_URL)
     else:
-        with open(TODO_PATH, 'w', encoding='utf-8') as f:
+        forget_content(TODO_PATH)
+        # newline='' to match read_content, so CRLF is written back as is
+        with open(TODO_PATH, 'w', encoding='utf-8', newline='') as f:
             f.write(content)
 
+def split_lines(content):
+    global _LINES_CACHE
+    cached = _LINES_CACHE
+    if cached[0] == content:
+        return cached[1]
+    
+    lines = content.splitlines(keepends=True)
+    _LINES_CACHE = (content, lines)
+    return lines
+
+def read_line(line_index):
+    # Returns the content alongside the line so callers can write_line it back
+    content = read_content(fresh=True)
+    lines = split_lines(content)
+    if line_index >= len(lines):
+        return content, None
+    return content, lines[line_index].splitlines()[0]
+
+def write_line(content, line_index, new_line):
+    lines = split_lines(content)
+    # Offsets are only needed for the one line being written
+    start = sum(map(len, lines[:line_index]))
+    old_line = lines[line_index].splitlines()[0]
+    end = start + len(old_line)
+    
+    if not USE_WEBDAV and hasattr(os, 'pwrite'):
+        # Same byte length: overwrite the line in place
+        new_bytes = new_line.encode('utf-8')
+        if len(new_bytes) == len(old_line.encode('utf-8')):
+            byte_start = len(content[:start].encode('utf-8'))
+            forget_content(TODO_PATH)
+            fd = os.open(TODO_PATH, os.O_RDWR)
+            try:
+                os.pwrite(fd, new_bytes, byte_start)
+            finally:
+                os.close(fd)
+            return
+    
+    write_content(content[:start] + new_line + content[end:])
+
+# In-memory copy of settings.json, loaded on first use
+_SETTINGS = None
+
 def load_settings():
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = read_settings_file()
+    return _SETTINGS
+
+def read_settings_file():
     if not os.path.exists(CONFIG_PATH):
         return {}
     try:
@@ -74,6 +206,11 @@ def load_settings():
         return {}
 
 def save_settings(settings):
+    global _SETTINGS
+    # Query params repeat the current settings on most page loads
+    if settings == load_settings():
+        return
+    _SETTINGS = settings
     try:
         os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
         with open(CONFIG_PATH, 'w') as f:
@@ -81,69 +218,87 @@ def save_settings(settings):
     except Exception as e:
         print(f"Error saving settings: {e}")
 
-def load_todos():
-    content = read_content()
+def load_todos(content):
+    global _TODOS_CACHE
     if not content:
         return []
     
+    # read_content hands back the same string object while the file is
+    # unchanged, so this comparison is normally an identity check.
+    cached = _TODOS_CACHE
+    if cached[0] == content:
+        return cached[1]
+    
     items = []
     current_section = "Ohne Abschnitt"
     
     for line_index, line in enumerate(content.splitlines()):
-        trimmed = line.strip()
-        if trimmed.startswith("###"):
-            current_section = trimmed.lstrip('#').strip()
+        # Headers are almost never indented, so avoid stripping every line
+        if line.startswith("###") or (line[:1].isspace() and line.lstrip().startswith("###")):
+            # A handful of sections are shared by many todos
+            current_section = sys.intern(line.lstrip().lstrip('#').strip())
+            continue
+        
+        # Cheap reject for blank lines, prose, separators etc.
+        if "- [" not in line:
             continue
         
         item = parse_line(line, line_index, current_section)
         if item:
+            add_sort_keys(item)
             items.append(item)
     
+    _TODOS_CACHE = (content, items)
     return items
 
+def checkbox_state(line):
+    # True/False for a todo line, None for anything else
+    return _CB_STATES.get(line.lstrip()[:5])
+
 def parse_line(line, line_index, section):
     trimmed = line.lstrip()
-    done = False
-    rest = ""
-    
-    if trimmed.startswith("- [x]"):
-        done = True
-        rest = trimmed[5:].strip()
-    elif trimmed.startswith("- [X]"):
-        done = True
-        rest = trimmed[5:].strip()
-    elif trimmed.startswith("- [ ]"):
-        done = False
-        rest = trimmed[5:].strip()
-    else:
+    done = _CB_STATES.get(trimmed[:5])
+    if done is None:
         return None
     
+    rest = trimmed[5:].strip()
+    
     title = extract_title(rest)
-    project = capture_token(PROJECT_RE, rest)
-    context = capture_token(CONTEXT_RE, rest)
-    due_str = capture_token(DUE_RE, rest)
+    tokens = {}
+    for match in TOKEN_RE.finditer(rest):
+        # First occurrence wins, as with the former per-field searches
+        tokens.setdefault(match.lastgroup, match.group(match.lastgroup).strip())
+    
+    project = tokens.get('project')
+    if project:
+        project = sys.intern(project)
+    context = tokens.get('context')
+    if context:
+        context = sys.intern(context)
+    due_str = tokens.get('due')
     due = None
     if due_str:
         try:
-            due = datetime.strptime(due_str, "%Y-%m-%d").date()
+            # TOKEN_RE guarantees the YYYY-MM-DD shape
+            due = date(int(due_str[0:4]), int(due_str[5:7]), int(due_str[8:10]))
         except ValueError:
             pass
     
-    reference = capture_token(LINK_RE, rest)
-    marker = capture_token(ID_RE, rest)
-    
-    return {
-        'line_index': line_index,
-        'marker': marker,
-        'title': title,
-        'section': section,
-        'project': project,
-        'context': context,
-        'due': due,
-        'reference': reference,
-        'done': done,
-        'raw_line': line
-    }
+    reference = tokens.get('reference')
+    marker = tokens.get('marker')
+    
+    return Todo(
+        line_index=line_index,
+        marker=marker,
+        title=title,
+        section=section,
+        project=project,
+        context=context,
+        due=due,
+        reference=reference,
+        done=done,
+        raw_line=line
+    )
 
 def capture_token(regex, text):
     match = regex.search(text)
@@ -152,89 +307,95 @@ def capture_token(regex, text):
     return None
 
 def extract_title(rest):
-    markers = [" +", " @", " due:", " [[", " ✅", " ^", "+", "@", "due:", "[[", "✅", "^"]
-    cut = len(rest)
-    for marker in markers:
-        idx = rest.find(marker)
-        if idx != -1 and idx < cut:
-            cut = idx
+    match = TITLE_CUT_RE.search(rest)
+    cut = match.start() if match else len(rest)
     
     raw = rest[:cut]
     cleaned = raw.strip()
     return cleaned if cleaned else rest.strip()
 
-def toggle_todo(line_index, done):
-    content = read_content()
-    lines = content.splitlines()
+def toggle_todo(line_index):
+    content, line = read_line(line_index)
     
-    if line_index < len(lines):
-        lines[line_index] = rewrite_line(lines[line_index], done)
-        write_content('\n'.join(lines) + '\n')
+    if line is not None:
+        done = bool(checkbox_state(line))
+        write_line(content, line_index, rewrite_line(line, not done))
 
 def rewrite_line(line, done):
     updated = line
     # Remove existing completion marker first
-    updated = COMPLETION_RE.sub("", updated)
+    if "✅" in updated:
+        updated = COMPLETION_RE.sub("", updated)
+    
+    # Swap the checkbox in place
+    idx = updated.find("- [")
+    if idx != -1 and updated[idx:idx + 5] in _CB_STATES:
+        updated = updated[:idx] + (_CB_CHECKED_LC if done else _CB_UNCHECKED) + updated[idx + 5:]
     
     if done:
-        updated = updated.replace("- [ ]", "- [x]", 1)
-        updated = updated.replace("- [X]", "- [x]", 1)
         today = datetime.now().strftime("%Y-%m-%d")
         updated = updated.rstrip() + f" ✅ {today}"
-    else:
-        updated = updated.replace("- [x]", "- [ ]", 1)
-        updated = updated.replace("- [X]", "- [ ]", 1)
     
     return updated
 
 def add_todo(title):
-    content = read_content()
+    content = read_content(fresh=True)
     lines = content.splitlines()
     
     insert_index = len(lines)
     for i, line in enumerate(lines):
-        if line.strip() == "---":
+        if "---" in line and line.strip() == "---":
             insert_index = i
             break
     
     today = datetime.now().strftime("%Y-%m-%d")
-    new_line = f"- [ ] {title} due:{today}"
+    new_line = f"{_CB_UNCHECKED} {title} due:{today}"
     lines.insert(insert_index, new_line)
     
     write_content('\n'.join(lines) + '\n')
 
+def fold(text):
+    # casefold is only needed beyond ASCII, where lower is cheaper
+    return text.lower() if text.isascii() else text.casefold()
+
+def add_sort_keys(todo):
+    # Built once per parse; index() sorts on the stored tuples
+    todo.topic_key = sort_key_topic(todo)
+    todo.location_key = sort_key_location(todo)
+    todo.date_key = sort_key_date(todo)
+
 def sort_key_topic(todo):
     # Project (asc), Section (asc), Title (asc), Context (asc)
     # Rust: Some < None (With Project comes before Without Project)
-    p = todo['project']
-    c = todo['context']
+    p = todo.project
+    c = todo.context
     return (
-        0 if p else 1, p.lower() if p else "",
-        todo['section'].lower(),
-        todo['title'].lower(),
-        0 if c else 1, c.lower() if c else ""
+        0 if p else 1, fold(p) if p else "",
+        fold(todo.section),
+        fold(todo.title),
+        0 if c else 1, fold(c) if c else ""
     )
 
 def sort_key_location(todo):
     # Context (asc), Section (asc), Title (asc), Project (asc)
     # Rust: Some < None (With Context comes before Without Context)
-    p = todo['project']
-    c = todo['context']
+    p = todo.project
+    c = todo.context
     return (
-        0 if c else 1, c.lower() if c else "",
-        todo['section'].lower(),
-        todo['title'].lower(),
-        0 if p else 1, p.lower() if p else ""
+        0 if c else 1, fold(c) if c else "",
+        fold(todo.section),
+        fold(todo.title),
+        0 if p else 1, fold(p) if p else ""
     )
 
 def sort_key_date(todo):
     # Due (asc), then Project sort
     # Rust: None < Some (No Date comes before With Date)
-    d = todo['due']
-    key_project = sort_key_topic(todo)
+    d = todo.due
+    key_project = todo.topic_key
     
     if d is None:
-        return (0, datetime.min.date(), key_project)
+        return (0, date.min, key_project)
     else:
         return (1, d, key_project)
 
@@ -243,7 +404,8 @@ def index():
     if 'logged_in' not in session:
         return redirect(url_for('login'))
     
-    todos = load_todos()
+    content = read_content()
+    todos = load_todos(content)
     
     # Load saved settings
     settings = load_settings()
@@ -286,52 +448,59 @@ def index():
     sort_mode = sort_mode_val
     
     today = datetime.now().date()
-    filtered_todos = []
+    partial = bool(request.args.get('partial'))
+    
+    # Weak ETag over everything the page depends on; str hashes are cached,
+    # so this is cheap even for a large file
+    etag = f"{hash((content, show_done, show_due_only, sort_mode, today, partial)) & 0xffffffffffffffff:x}"
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    # Grouping logic for display
+    # The section label shown for each item depends on the sort mode, similar
+    # to Rust's group_label. Date sort has no grouping there (None), so every
+    # item gets the same empty label and no headers are printed.
+    if sort_mode == 'topic':
+        section_fn = lambda todo: f"Thema: {todo.project if todo.project else 'Ohne Projekt'}"
+    elif sort_mode == 'location':
+        section_fn = lambda todo: f"Ort: {todo.context if todo.context else 'Ohne Ort'}"
+    elif sort_mode == 'date':
+        section_fn = lambda todo: ""
+    else:
+        section_fn = attrgetter('section')
+    
+    display_todos = []
     
     for todo in todos:
-        if not show_done and todo['done']:
+        if not show_done and todo.done:
             continue
         
         if show_due_only:
-            if todo['due'] and todo['due'] > today:
+            if todo.due and todo.due > today:
                 continue
         
-        filtered_todos.append(todo)
+        # (label, todo) pairs; the cached todos are shared, never copied
+        display_todos.append((section_fn(todo), todo))
     
     # Sorting logic
     if sort_mode == 'location':
-        filtered_todos.sort(key=sort_key_location)
+        display_todos.sort(key=lambda entry: entry[1].location_key)
     elif sort_mode == 'date':
-        filtered_todos.sort(key=sort_key_date)
+        display_todos.sort(key=lambda entry: entry[1].date_key)
     else: # topic
-        filtered_todos.sort(key=sort_key_topic)
-    
-    # Grouping logic for display
-    # We need to adjust the 'section' field of the todo items for display purposes
-    # based on the sort mode, similar to Rust's group_label
-    
-    display_todos = []
-    for todo in filtered_todos:
-        display_item = todo.copy()
-        if sort_mode == 'topic':
-            display_item['section'] = f"Thema: {todo['project'] if todo['project'] else 'Ohne Projekt'}"
-        elif sort_mode == 'location':
-            display_item['section'] = f"Ort: {todo['context'] if todo['context'] else 'Ohne Ort'}"
-        elif sort_mode == 'date':
-            # No grouping for date sort in Rust implementation (returns None)
-            # But the template expects a section. Let's use a dummy or empty section?
-            # Or maybe we should group by date?
-            # Rust implementation returns None for group_label in Date mode.
-            # In the template, if section changes, it prints a header.
-            # If we set all sections to the same value, no headers will be printed (except the first one).
-            display_item['section'] = "" 
-        
-        display_todos.append(display_item)
+        display_todos.sort(key=lambda entry: entry[1].topic_key)
 
-    if request.args.get('partial'):
-        return render_template('_todo_list.html', todos=display_todos, show_done=show_done, show_due_only=show_due_only, sort_mode=sort_mode)
-
-    return render_template('index.html', todos=display_todos, show_done=show_done, show_due_only=show_due_only, sort_mode=sort_mode)
+    if partial:
+        response = make_response(render_template('_todo_list.html', todos=display_todos, show_done=show_done, show_due_only=show_due_only, sort_mode=sort_mode))
+    else:
+        response = make_response(render_template('index.html', todos=display_todos, show_done=show_done, show_due_only=show_due_only, sort_mode=sort_mode))
+    
+    response.set_etag(etag, weak=True)
+    # Let browsers cache the page but always revalidate it
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -351,19 +520,7 @@ def toggle(line_index):
     if 'logged_in' not in session:
         return redirect(url_for('login'))
     
-    # We need to know if it's currently done or not.
-    # Ideally we pass the state, or we read it.
-    # For simplicity, let's read and flip.
-    # But wait, toggle_todo takes 'done' target state.
-    
-    # Let's just read the file again to check current state
-    content = read_content()
-    lines = content.splitlines()
-    
-    if line_index < len(lines):
-        line = lines[line_index]
-        is_done = "- [x]" in line or "- [X]" in line
-        toggle_todo(line_index, not is_done)
+    toggle_todo(line_index)
     
     return redirect(url_for('index'))
 
@@ -372,13 +529,11 @@ def postpone(line_index, target):
     if 'logged_in' not in session:
         return redirect(url_for('login'))
     
-    content = read_content()
-    lines = content.splitlines()
+    content, line = read_line(line_index)
     
-    if line_index >= len(lines):
+    if line is None:
         return redirect(url_for('index'))
         
-    line = lines[line_index]
     item = parse_line(line, line_index, "")
     if not item:
         return redirect(url_for('index'))
@@ -394,26 +549,26 @@ def postpone(line_index, target):
     # Let's reuse the logic from edit but simpler
     
     # Reconstruct line
-    original_line = lines[line_index]
+    original_line = line
     marker = capture_token(ID_RE, original_line)
     
-    new_line = "- [x] " if item['done'] else "- [ ] "
-    new_line += item['title'].strip()
+    new_line = (_CB_CHECKED_LC if item.done else _CB_UNCHECKED) + " "
+    new_line += item.title.strip()
     
-    if item['project'] and item['project'].strip():
-        new_line += f" +{item['project'].strip()}"
+    if item.project and item.project.strip():
+        new_line += f" +{item.project.strip()}"
         
-    if item['context'] and item['context'].strip():
-        new_line += f" @{item['context'].strip()}"
+    if item.context and item.context.strip():
+        new_line += f" @{item.context.strip()}"
         
     # Always set the new due date
     new_line += f" due:{new_date.strftime('%Y-%m-%d')}"
         
-    if item['reference'] and item['reference'].strip():
-        new_line += f" [[{item['reference'].strip()}]]"
+    if item.reference and item.reference.strip():
+        new_line += f" [[{item.reference.strip()}]]"
         
     # Preserve completion date if done
-    if item['done']:
+    if item.done:
          match = COMPLETION_RE.search(original_line)
          if match:
              new_line += match.group(0)
@@ -421,8 +576,7 @@ def postpone(line_index, target):
     if marker:
         new_line += f" ^{marker}"
         
-    lines[line_index] = new_line
-    write_content('\n'.join(lines) + '\n')
+    write_line(content, line_index, new_line)
     
     return redirect(url_for('index'))
 
@@ -436,10 +590,9 @@ def edit(line_index):
     if 'logged_in' not in session:
         return redirect(url_for('login'))
     
-    content = read_content()
-    lines = content.splitlines()
+    content, line = read_line(line_index)
     
-    if line_index >= len(lines):
+    if line is None:
         return redirect(url_for('index'))
         
     if request.method == 'POST':
@@ -451,7 +604,7 @@ def edit(line_index):
         done = request.form.get('done') == 'on'
         
         # Reconstruct line
-        original_line = lines[line_index]
+        original_line = line
         marker = capture_token(ID_RE, original_line)
         
         # Handle completion date
@@ -459,14 +612,14 @@ def edit(line_index):
         if done:
             match = COMPLETION_RE.search(original_line)
             # If it was already done, preserve the date
-            if match and ("- [x]" in original_line or "- [X]" in original_line):
+            if match and checkbox_state(original_line):
                  completion_str = match.group(0)
             else:
                  # Otherwise add today's date
                  today = datetime.now().strftime("%Y-%m-%d")
                  completion_str = f" ✅ {today}"
 
-        new_line = "- [x] " if done else "- [ ] "
+        new_line = (_CB_CHECKED_LC if done else _CB_UNCHECKED) + " "
         new_line += title.strip()
         
         if project and project.strip():
@@ -491,13 +644,11 @@ def edit(line_index):
         if marker:
             new_line += f" ^{marker}"
             
-        lines[line_index] = new_line
-        write_content('\n'.join(lines) + '\n')
+        write_line(content, line_index, new_line)
         
         return redirect(url_for('index'))
     
     # GET request
-    line = lines[line_index]
     # We need to parse it to pre-fill the form
     # We can reuse parse_line but we need a dummy section
     item = parse_line(line, line_index, "")
@@ -511,22 +662,21 @@ def get_todo_json(line_index):
     if 'logged_in' not in session:
         return {'error': 'Unauthorized'}, 401
     
-    content = read_content()
-    lines = content.splitlines()
+    _, line = read_line(line_index)
     
-    if line_index >= len(lines):
+    if line is None:
         return {'error': 'Not found'}, 404
         
-    line = lines[line_index]
     item = parse_line(line, line_index, "")
     if not item:
         return {'error': 'Invalid item'}, 400
         
+    data = item.to_dict()
     # Convert date to string for JSON
-    if item['due']:
-        item['due'] = item['due'].strftime("%Y-%m-%d")
+    if data['due']:
+        data['due'] = data['due'].strftime("%Y-%m-%d")
         
-    return item
+    return data
 
 @app.route('/add', methods=['POST'])
 def add():